@@ -1,4 +1,4 @@
-from _core import is_convex, Polygonate  # noqa
+from _core import is_convex, PolygonateGA  # noqa
 from _version import get_versions
 
 __version__ = get_versions()["version"]
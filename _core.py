@@ -1,9 +1,8 @@
-import tkinter as tk
-from tkinter import Canvas
 import random
+import time
 import numpy as np
 from typing import Iterable
-from typing import Iterable, List, Tuple
+from typing import Iterable, List, Optional, Tuple
 
 
 points = []
@@ -28,13 +27,20 @@ def is_convex(polygon: Iterable) -> bool:
     return True
 
 
+def _expired(deadline: Optional[float]) -> bool:
+    return deadline is not None and time.monotonic() >= deadline
+
+
 class PolygonateGA:
 
-    def __init__(self, points: Iterable, pop_size: int = 100, generations: int = 500, mutation_rate: float = 0.1):
+    def __init__(self, points: Iterable, pop_size: int = 100, generations: int = 500, mutation_rate: float = 0.1,
+                 deadline: Optional[float] = None):
         self._points = np.array(points)
         self.pop_size = pop_size
         self.generations = generations
         self.mutation_rate = mutation_rate
+        self.deadline = deadline
+        self.generations_run = 0
         self.population = self._initialize_population()
 
     def _initialize_population(self) -> List[List[List[int]]]:
@@ -45,6 +51,8 @@ class PolygonateGA:
         population = []
         indices = list(range(len(self._points)))
         for _ in range(self.pop_size):
+            if population and _expired(self.deadline):
+                break
             random.shuffle(indices)
             population.append(self._create_random_tessellation(indices))
         return population
@@ -112,7 +120,10 @@ class PolygonateGA:
         return self.population[idx1], self.population[idx2]
 
     def optimize(self) -> List[List[int]]:
+        self.generations_run = 0
         for _ in range(self.generations):
+            if _expired(self.deadline):
+                break
             fitness_scores = [self._fitness(tess) for tess in self.population]
             new_population = []
             for _ in range(self.pop_size // 2):
@@ -121,89 +132,19 @@ class PolygonateGA:
                 offspring2 = self._mutate(self._crossover(parent2, parent1))
                 new_population.extend([offspring1, offspring2])
             self.population = new_population
-        fitness_scores = [self._fitness(tess) for tess in self.population]
+            self.generations_run += 1
+        fitness_scores = []
+        for tess in self.population:
+            if fitness_scores and _expired(self.deadline):
+                break
+            fitness_scores.append(self._fitness(tess))
         best_tessellation = self.population[np.argmin(fitness_scores)]
         return [list(set(poly)) for poly in best_tessellation if len(set(poly)) > 2]
 
-class PointInputWindow:
-    def __init__(self, master):
-        self.master = master
-        master.title("Point Input")
-
-        self.canvas_width = 400
-        self.canvas_height = 300
-        self.canvas = Canvas(master, width=self.canvas_width, height=self.canvas_height, bg="white")
-        self.canvas.pack()
-
-        self.points = []
-        self.point_radius = 3
-        self.grid_color = "lightgrey"
-        self.grid_spacing = 20
-
-        self.draw_grid()
-
-        self.canvas.bind("<Button-1>", self.add_point)
-        self.canvas.bind("<Configure>", self.redraw_grid) 
-
-        self.coordinates_label = tk.Label(master, text="Coordinates:")
-        self.coordinates_label.pack()
-
-        self.coordinates_text = tk.Text(master, height=5, width=40)
-        self.coordinates_text.pack()
-
-        self.process_button = tk.Button(master, text="Начать обработку", command=self.start_processing)
-        self.process_button.pack()
-
-        self.update_coordinates_display()
-
-        self.ga = None
-
-    def draw_grid(self):
-        for i in range(0, self.canvas_width, self.grid_spacing):
-            self.canvas.create_line(i, 0, i, self.canvas_height, fill=self.grid_color, tag="grid")
-        for i in range(0, self.canvas_height, self.grid_spacing):            self.canvas.create_line(0, i, self.canvas_width, i, fill=self.grid_color, tag="grid")
-
-    def redraw_grid(self, event=None):
-        self.canvas_width = event.width
-        self.canvas_height = event.height
-        self.canvas.delete("grid")
-        self.draw_grid()
-        self.redisplay_points()
-
-    def redisplay_points(self):
-        for x, y in self.points:
-            self.canvas.create_oval(x - self.point_radius, y - self.point_radius,
-                                     x + self.point_radius, y + self.point_radius,
-                                     fill="black", outline="black")
-
-    def add_point(self, event):
-        x = event.x
-        y = event.y
-        self.points.append((x, y))
-        self.canvas.create_oval(x - self.point_radius, y - self.point_radius,
-                                 x + self.point_radius, y + self.point_radius,
-                                 fill="black", outline="black")
-        self.update_coordinates_display()
-
-    def update_coordinates_display(self):
-        self.coordinates_text.delete("1.0", tk.END)
-        self.coordinates_text.insert(tk.END, "Coordinates:\n")
-        for x, y in self.points:
-            self.coordinates_text.insert(tk.END, f"({x}, {y})\n")
-
-    def start_processing(self):
-
-        if not self.points:
-            self.coordinates_text.insert(tk.END, "Please add points first.\n")
-            return
-        self.ga = PolygonateGA(self.points)
-        optimized_solution = self.ga.optimize()
-
-        self.coordinates_text.insert(tk.END, "\nOptimized Solution:\n")
-        self.coordinates_text.insert(tk.END, str(optimized_solution))
-
-
 if __name__ == "__main__":
+    import tkinter as tk
+    from _gui import PointInputWindow
+
     root = tk.Tk()
     window = PointInputWindow(root)
     root.mainloop()
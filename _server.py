@@ -0,0 +1,455 @@
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import signal
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Connection
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from _core import PolygonateGA
+
+
+MAX_BODY_SIZE = 1 << 20
+READ_TIMEOUT = 10.0
+TIME_BUDGET_GRACE = 1.0
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    408: "Request Timeout",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+    504: "Gateway Timeout",
+}
+
+Points = Tuple[Tuple[float, float], ...]
+JobKey = Tuple[Points, int, int, float]
+Tessellation = List[List[int]]
+
+
+class HTTPError(Exception):
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _solve(points: Points, pop_size: int, generations: int, mutation_rate: float,
+           time_budget: float) -> Tuple[Tessellation, bool]:
+    # The budget covers building the initial population as well as the generations.
+    deadline = time.monotonic() + time_budget
+    ga = PolygonateGA(points, pop_size=pop_size, generations=generations, mutation_rate=mutation_rate,
+                      deadline=deadline)
+    tessellation = ga.optimize()
+    return tessellation, ga.generations_run == generations
+
+
+def _worker_main(conn: Connection) -> None:
+    # Ctrl-C reaches the whole process group; the server shuts its workers down itself.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    conn.send(None)
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        try:
+            reply = (True, _solve(*job))
+        except Exception as e:
+            reply = (False, e)
+        conn.send(reply)
+
+
+class _Worker:
+    """A GA process that runs one job at a time.
+
+    The process is killed when a job overruns its budget or the pipe breaks, and respawned on the
+    next job. Every method blocks, so call them from a thread rather than the event loop.
+    """
+
+    def __init__(self):
+        self._process: Optional[multiprocessing.process.BaseProcess] = None
+        self._conn: Optional[Connection] = None
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._process.pid if self._process is not None else None
+
+    def start(self) -> None:
+        if self._process is not None:
+            return
+        # Forked workers would inherit open client sockets and hold connections open, so spawn them.
+        context = multiprocessing.get_context("spawn")
+        conn, child_conn = context.Pipe()
+        process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        process.start()
+        child_conn.close()
+        self._process, self._conn = process, conn
+        conn.recv()
+
+    def run(self, job: Tuple[Points, int, int, float], deadline: float) -> Tuple[bool, Any]:
+        """Run ``job`` until ``deadline`` and return the worker's ``(ok, value)`` reply."""
+        self.start()
+        conn = self._conn
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise HTTPError(504, "Time budget expired before the job started.")
+        try:
+            conn.send(job + (remaining,))
+            if conn.poll(remaining + TIME_BUDGET_GRACE):
+                return conn.recv()
+        except (EOFError, OSError):
+            self.kill()
+            raise
+        self.kill()
+        raise HTTPError(504, "Time budget exceeded.")
+
+    def kill(self) -> None:
+        process, conn = self._process, self._conn
+        self._process = self._conn = None
+        if process is not None:
+            process.kill()
+            process.join()
+            conn.close()
+
+
+def _finite_number(value: Any) -> Optional[float]:
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        return None
+    try:
+        # JSON integers are unbounded and may not fit in a float.
+        value = float(value)
+    except OverflowError:
+        return None
+    return value if math.isfinite(value) else None
+
+
+def _parse_points(raw: Any) -> Points:
+    if not isinstance(raw, list) or len(raw) < 3:
+        raise HTTPError(400, "'points' must be a list of at least 3 [x, y] pairs.")
+    points = []
+    for point in raw:
+        coordinates = [_finite_number(c) for c in point] if isinstance(point, list) else []
+        if len(coordinates) != 2 or None in coordinates:
+            raise HTTPError(400, "Every point must be a pair of finite numbers.")
+        points.append((coordinates[0], coordinates[1]))
+    return tuple(points)
+
+
+class TessellationServer:
+    """Local HTTP server that queues point sets and solves them on a pool of ``PolygonateGA`` workers.
+
+    Identical requests with the same time budget share one in-flight job, and results of runs that
+    completed every generation are kept in an LRU cache. Listens on ``host``/``port`` or, when
+    ``path`` is given, on a Unix socket.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, path: Optional[str] = None,
+                 workers: int = 2, max_queue_depth: int = 64, cache_size: int = 256,
+                 time_budget: float = 10.0, max_time_budget: float = 60.0, pop_size: int = 100,
+                 generations: int = 500, mutation_rate: float = 0.1):
+        if workers < 1:
+            raise ValueError("At least one worker is required.")
+        if max_queue_depth < 1:
+            raise ValueError("max_queue_depth must be positive.")
+        if not 0 < time_budget <= max_time_budget:
+            raise ValueError("time_budget must be positive and at most max_time_budget.")
+        if pop_size < 2:
+            raise ValueError("pop_size must be at least 2.")
+        if generations < 0:
+            raise ValueError("generations must not be negative.")
+        if not 0 <= mutation_rate <= 1:
+            raise ValueError("mutation_rate must be between 0 and 1.")
+        self.host = host
+        self.port = port
+        self.path = path
+        self.workers = workers
+        self.max_queue_depth = max_queue_depth
+        self.cache_size = cache_size
+        self.time_budget = time_budget
+        self.max_time_budget = max_time_budget
+        self.pop_size = pop_size
+        self.generations = generations
+        self.mutation_rate = mutation_rate
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._workers: List[_Worker] = []
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._dispatchers: List[asyncio.Task] = []
+        self._busy = 0
+        self._pending: Dict[Tuple[JobKey, float], asyncio.Future] = {}
+        self._cache: OrderedDict[JobKey, Tessellation] = OrderedDict()
+
+        self._started_at = time.monotonic()
+        self._latencies: Deque[float] = deque(maxlen=1024)
+        self._counters = dict.fromkeys(
+            ("requests", "completed", "cache_hits", "coalesced", "rejected", "timeouts", "failed"), 0)
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._threads = ThreadPoolExecutor(max_workers=self.workers)
+        self._workers = [_Worker() for _ in range(self.workers)]
+        await asyncio.gather(*(loop.run_in_executor(self._threads, w.start) for w in self._workers))
+        self._queue = asyncio.Queue(maxsize=self.max_queue_depth)
+        self._dispatchers = [asyncio.ensure_future(self._dispatch(i)) for i in range(self.workers)]
+        if self.path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=self.path)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+            self.port = self._server.sockets[0].getsockname()[1]
+        self._started_at = time.monotonic()
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            # Remove the socket file first, before anything that blocks and could be interrupted.
+            if self.path is not None:
+                try:
+                    os.unlink(self.path)
+                except FileNotFoundError:
+                    pass
+            await self._server.wait_closed()
+        for task in self._dispatchers:
+            task.cancel()
+        # Killing the workers also wakes any thread still waiting on a reply.
+        for worker in self._workers:
+            worker.kill()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._dispatchers = []
+        self._workers = []
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(HTTPError(503, "Server is shutting down."))
+        self._pending.clear()
+        if self._threads is not None:
+            self._threads.shutdown(wait=False)
+
+    def metrics(self) -> Dict[str, Any]:
+        uptime = time.monotonic() - self._started_at
+        latencies = sorted(self._latencies)
+        metrics = dict(self._counters)
+        metrics.update({
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue_depth": self.max_queue_depth,
+            "in_flight": len(self._pending),
+            "busy_workers": self._busy,
+            "cache_entries": len(self._cache),
+            "uptime": uptime,
+            "throughput": self._counters["completed"] / uptime if uptime > 0 else 0.0,
+            "latency": {
+                "mean": sum(latencies) / len(latencies) if latencies else None,
+                "p50": latencies[len(latencies) // 2] if latencies else None,
+                "p95": latencies[int(len(latencies) * 0.95)] if latencies else None,
+                "max": latencies[-1] if latencies else None,
+            },
+        })
+        return metrics
+
+    async def submit(self, points: Points, time_budget: Optional[float] = None) -> Tuple[Tessellation, bool]:
+        """Solve ``points`` and return the tessellation and whether every generation ran.
+
+        A cached complete result or an in-flight job with the same budget is reused when possible.
+        """
+        self._counters["requests"] += 1
+        started = time.monotonic()
+        key = (points, self.pop_size, self.generations, self.mutation_rate)
+        budget = self.time_budget if time_budget is None else min(time_budget, self.max_time_budget)
+
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self._counters["cache_hits"] += 1
+            result = self._cache[key], True
+        else:
+            future = self._pending.get((key, budget))
+            if future is not None:
+                self._counters["coalesced"] += 1
+            else:
+                if self._queue.full():
+                    self._counters["rejected"] += 1
+                    raise HTTPError(503, "Queue is full.")
+                future = asyncio.get_running_loop().create_future()
+                # Mark failures as retrieved even if every waiting client has disconnected.
+                future.add_done_callback(lambda f: f.cancelled() or f.exception())
+                self._pending[key, budget] = future
+                self._queue.put_nowait(((key, budget), started + budget, future))
+            result = await asyncio.shield(future)
+
+        self._counters["completed"] += 1
+        self._latencies.append(time.monotonic() - started)
+        return result
+
+    async def _dispatch(self, index: int) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            pending_key, deadline, future = await self._queue.get()
+            key = pending_key[0]
+            self._busy += 1
+            try:
+                if key in self._cache:
+                    result = self._cache[key], True
+                else:
+                    ok, value = await loop.run_in_executor(self._threads, self._workers[index].run, key, deadline)
+                    if not ok:
+                        raise value
+                    result = value
+                    if result[1]:
+                        self._remember(key, result[0])
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.set_exception(HTTPError(503, "Server is shutting down."))
+                raise
+            except HTTPError as e:
+                self._counters["timeouts"] += 1
+                future.set_exception(e)
+            except ValueError as e:
+                future.set_exception(HTTPError(400, str(e)))
+            except (EOFError, OSError) as e:
+                self._counters["failed"] += 1
+                future.set_exception(HTTPError(500, "Worker died: %r" % e))
+            except Exception as e:
+                self._counters["failed"] += 1
+                future.set_exception(HTTPError(500, "Worker failed: %s" % e))
+            else:
+                future.set_result(result)
+            finally:
+                self._busy -= 1
+                self._pending.pop(pending_key, None)
+                self._queue.task_done()
+
+    def _remember(self, key: JobKey, result: Tessellation) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = result
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                method, target, body = await self._read_request(reader)
+                status, payload = 200, await self._route(method, target, body)
+            except HTTPError as e:
+                status, payload = e.status, {"error": e.message}
+            except ConnectionError:
+                raise
+            except Exception as e:
+                status, payload = 500, {"error": str(e)}
+            data = json.dumps(payload).encode()
+            head = "HTTP/1.1 %d %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\n" % (
+                status, REASONS.get(status, ""), len(data))
+            if status == 503:
+                head += "Retry-After: 1\r\n"
+            writer.write((head + "Connection: close\r\n\r\n").encode() + data)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+        try:
+            return await asyncio.wait_for(self._read_message(reader), READ_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise HTTPError(408, "Timed out reading the request.")
+        except asyncio.IncompleteReadError:
+            raise HTTPError(400, "Request body is shorter than Content-Length.")
+        except (asyncio.LimitOverrunError, ValueError):
+            # StreamReader.readline() reports over-long lines as ValueError.
+            raise HTTPError(400, "Request line or header is too long.")
+
+    async def _read_message(self, reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+        request_line = (await reader.readline()).decode("latin-1").split()
+        if len(request_line) != 3:
+            raise HTTPError(400, "Malformed request line.")
+        method, target, _ = request_line
+        length = 0
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-length":
+                try:
+                    length = int(value)
+                except ValueError:
+                    raise HTTPError(400, "Invalid Content-Length.")
+        if length < 0:
+            raise HTTPError(400, "Invalid Content-Length.")
+        if length > MAX_BODY_SIZE:
+            raise HTTPError(413, "Request body too large.")
+        body = await reader.readexactly(length) if length else b""
+        return method, target, body
+
+    async def _route(self, method: str, target: str, body: bytes) -> Any:
+        path = target.split("?", 1)[0]
+        if path == "/metrics":
+            if method != "GET":
+                raise HTTPError(405, "Use GET.")
+            return self.metrics()
+        if path == "/tessellate":
+            if method != "POST":
+                raise HTTPError(405, "Use POST.")
+            try:
+                request = json.loads(body or b"null")
+            except ValueError:
+                raise HTTPError(400, "Body must be JSON.")
+            if not isinstance(request, dict):
+                raise HTTPError(400, "Body must be a JSON object.")
+            points = _parse_points(request.get("points"))
+            time_budget = request.get("time_budget")
+            if time_budget is not None:
+                time_budget = _finite_number(time_budget)
+                if time_budget is None or not time_budget > 0:
+                    raise HTTPError(400, "'time_budget' must be a positive, finite number of seconds.")
+            tessellation, complete = await self.submit(points, time_budget)
+            return {"tessellation": tessellation, "complete": complete}
+        raise HTTPError(404, "Unknown path %s." % path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve PolygonateGA tessellations on localhost.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix-socket", dest="path")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--max-queue-depth", type=int, default=64)
+    parser.add_argument("--cache-size", type=int, default=256)
+    parser.add_argument("--time-budget", type=float, default=10.0)
+    parser.add_argument("--max-time-budget", type=float, default=60.0)
+    parser.add_argument("--pop-size", type=int, default=100)
+    parser.add_argument("--generations", type=int, default=500)
+    parser.add_argument("--mutation-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    server = TessellationServer(host=args.host, port=args.port, path=args.path, workers=args.workers,
+                                max_queue_depth=args.max_queue_depth, cache_size=args.cache_size,
+                                time_budget=args.time_budget, max_time_budget=args.max_time_budget,
+                                pop_size=args.pop_size, generations=args.generations,
+                                mutation_rate=args.mutation_rate)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
@@ -15,6 +15,7 @@ def get_keywords():
     return keywords
 
 class VersioneerConfig:
+    """Container for Versioneer configuration parameters."""
 
 def get_config():
 
@@ -28,6 +29,7 @@ def get_config():
     return cfg
 
 class NotThisMethod(Exception):
+    """Exception raised if a method is not valid for the current scenario."""
 
 LONG_VERSION_PY = {}
 HANDLERS = {}
@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+import time
+
+import _core
+
+from _core import PolygonateGA, is_convex
+
+POINTS = [(0, 0), (1, 0), (1, 1), (0, 1), (2, 0), (2, 1), (3, 3)]
+
+
+def test_is_convex():
+    assert is_convex([(0, 0), (1, 0), (1, 1), (0, 1)])
+    assert not is_convex([(0, 0), (2, 0), (1, 1), (2, 2), (0, 2)])
+    assert not is_convex([(0, 0), (1, 1)])
+
+
+def test_optimize_runs_every_generation():
+    ga = PolygonateGA(POINTS, pop_size=10, generations=5)
+    tessellation = ga.optimize()
+    assert ga.generations_run == 5
+    assert all(len(poly) >= 3 for poly in tessellation)
+
+
+def test_optimize_past_deadline_runs_no_generations():
+    ga = PolygonateGA(POINTS, pop_size=10, generations=1000)
+    ga.deadline = time.monotonic()
+    ga.optimize()
+    assert ga.generations_run == 0
+
+
+def test_expired_deadline_limits_initial_population():
+    ga = PolygonateGA(POINTS, pop_size=50, deadline=0.0)
+    assert len(ga.population) == 1
+    ga.optimize()
+    assert ga.generations_run == 0
+
+
+def test_core_does_not_import_tkinter():
+    code = "import sys, _core; sys.exit('tkinter' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(_core.__file__)).returncode == 0
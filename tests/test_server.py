@@ -0,0 +1,241 @@
+import asyncio
+import json
+import os
+import time
+
+import pytest
+
+import _server
+from _server import TessellationServer
+
+SQUARE = [[0, 0], [1, 0], [1, 1], [0, 1], [2, 0], [2, 1], [3, 3]]
+# Enough generations that a run always ends on its time budget rather than completing.
+ENDLESS = 10 ** 6
+
+
+def shifted(offset):
+    return [[x + offset, y] for x, y in SQUARE]
+
+
+async def request(server, method, path, body=None, raw=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    data = raw if raw is not None else (json.dumps(body).encode() if body is not None else b"")
+    length = len(data) if raw is None else len(data) + 10
+    writer.write(("%s %s HTTP/1.1\r\nHost: localhost\r\nContent-Length: %d\r\n\r\n" % (method, path, length)).encode()
+                 + data)
+    if raw is not None:
+        writer.write_eof()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    lines = head.decode().split("\r\n")
+    headers = dict(line.split(": ", 1) for line in lines[1:])
+    return int(lines[0].split()[1]), headers, json.loads(payload)
+
+
+def serve(test, **options):
+    async def main():
+        server = TessellationServer(port=0, **options)
+        await server.start()
+        try:
+            return await test(server)
+        finally:
+            await server.close()
+
+    return asyncio.run(main())
+
+
+def test_caches_complete_results():
+    async def test(server):
+        first = await request(server, "POST", "/tessellate", {"points": SQUARE})
+        second = await request(server, "POST", "/tessellate", {"points": SQUARE})
+        assert first[0] == second[0] == 200
+        assert first[2]["complete"] and first[2] == second[2]
+        assert server.metrics()["cache_hits"] == 1
+
+    serve(test, pop_size=10, generations=5)
+
+
+def test_does_not_cache_runs_cut_short_by_budget():
+    async def test(server):
+        short = await request(server, "POST", "/tessellate", {"points": SQUARE, "time_budget": 0.05})
+        assert short[0] == 200 and not short[2]["complete"]
+        longer = await request(server, "POST", "/tessellate", {"points": SQUARE, "time_budget": 0.3})
+        assert longer[0] == 200
+        metrics = server.metrics()
+        assert metrics["cache_hits"] == 0 and metrics["cache_entries"] == 0
+
+    serve(test, pop_size=10, generations=ENDLESS)
+
+
+def test_coalesces_identical_requests_with_the_same_budget():
+    async def test(server):
+        same = {"points": SQUARE, "time_budget": 0.5}
+        other = {"points": SQUARE, "time_budget": 0.6}
+        first, second, third = await asyncio.gather(request(server, "POST", "/tessellate", same),
+                                                    request(server, "POST", "/tessellate", same),
+                                                    request(server, "POST", "/tessellate", other))
+        assert first[0] == second[0] == third[0] == 200
+        assert first[2] == second[2]
+        assert server.metrics()["coalesced"] == 1
+
+    serve(test, workers=2, pop_size=10, generations=ENDLESS)
+
+
+def test_rejects_requests_when_queue_is_full():
+    async def test(server):
+        running = asyncio.ensure_future(request(server, "POST", "/tessellate", {"points": shifted(0), "time_budget": 1}))
+        await asyncio.sleep(0.2)
+        queued = asyncio.ensure_future(request(server, "POST", "/tessellate", {"points": shifted(1), "time_budget": 3}))
+        await asyncio.sleep(0.2)
+        assert server.metrics()["queue_depth"] == 1
+        status, headers, payload = await request(server, "POST", "/tessellate", {"points": shifted(2)})
+        assert status == 503 and headers["Retry-After"] == "1"
+        assert (await running)[0] == (await queued)[0] == 200
+        assert server.metrics()["rejected"] == 1
+
+    serve(test, workers=1, max_queue_depth=1, pop_size=10, generations=ENDLESS)
+
+
+def test_times_out_requests_whose_budget_expires_in_the_queue():
+    async def test(server):
+        pid = server._workers[0].pid
+        running = asyncio.ensure_future(request(server, "POST", "/tessellate", {"points": shifted(0), "time_budget": 1}))
+        await asyncio.sleep(0.2)
+        status, _, payload = await request(server, "POST", "/tessellate", {"points": shifted(1), "time_budget": 0.2})
+        assert status == 504
+        assert (await running)[0] == 200
+        assert server.metrics()["timeouts"] == 1
+        # Expiring in the queue says nothing about the worker, so it is kept.
+        assert server._workers[0].pid == pid
+
+    serve(test, workers=1, pop_size=10, generations=ENDLESS)
+
+
+def test_replaces_worker_that_overruns_its_budget(monkeypatch):
+    # A negative grace makes the server give up before the GA's own deadline.
+    monkeypatch.setattr(_server, "TIME_BUDGET_GRACE", -0.7)
+
+    async def test(server):
+        pid = server._workers[0].pid
+        started = time.monotonic()
+        status, _, _ = await request(server, "POST", "/tessellate", {"points": shifted(0), "time_budget": 1})
+        assert status == 504 and time.monotonic() - started < 0.9
+        assert server._workers[0].pid is None
+        monkeypatch.setattr(_server, "TIME_BUDGET_GRACE", 1.0)
+        status, _, payload = await request(server, "POST", "/tessellate", {"points": shifted(1), "time_budget": 0.3})
+        assert status == 200 and "tessellation" in payload
+        assert server._workers[0].pid not in (None, pid)
+        metrics = server.metrics()
+        assert metrics["timeouts"] == 1 and metrics["in_flight"] == metrics["busy_workers"] == 0
+
+    serve(test, workers=1, pop_size=10, generations=ENDLESS)
+
+
+def test_caps_time_budget_at_server_maximum():
+    async def test(server):
+        started = time.monotonic()
+        status, _, payload = await request(server, "POST", "/tessellate", {"points": SQUARE, "time_budget": 1e9})
+        assert status == 200 and not payload["complete"]
+        assert time.monotonic() - started < 2
+
+    serve(test, pop_size=10, generations=ENDLESS, time_budget=0.2, max_time_budget=0.3)
+
+
+def test_rejects_invalid_requests():
+    async def test(server):
+        bodies = [
+            {},
+            {"points": [[0, 0], [1, 1]]},
+            {"points": [[0, 0], [1, "x"], [1, 1]]},
+            {"points": [[0, 0], [1, 0, 2], [1, 1]]},
+            {"points": SQUARE, "time_budget": "fast"},
+            {"points": SQUARE, "time_budget": -1},
+            {"points": SQUARE, "time_budget": True},
+            {"points": [[0, 0], [1, 0], [10 ** 400, 1]]},
+            {"points": SQUARE, "time_budget": 10 ** 400},
+            [1, 2, 3],
+        ]
+        for body in bodies:
+            assert (await request(server, "POST", "/tessellate", body))[0] == 400, body
+        assert (await request(server, "POST", "/tessellate"))[0] == 400
+        infinite = b'{"points": [[0, 0], [1, 0], [1, 1]], "time_budget": Infinity}'
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        writer.write(b"POST /tessellate HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % len(infinite) + infinite)
+        assert (await reader.read()).startswith(b"HTTP/1.1 400")
+        writer.close()
+        # The declared Content-Length is longer than the body actually sent.
+        assert (await request(server, "POST", "/tessellate", raw=b'{"points": '))[0] == 400
+
+    serve(test, pop_size=10, generations=5)
+
+
+def test_times_out_idle_clients(monkeypatch):
+    monkeypatch.setattr(_server, "READ_TIMEOUT", 0.2)
+
+    async def test(server):
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        writer.write(b"POST /tessellate HTTP/1.1\r\n")
+        assert (await asyncio.wait_for(reader.read(), 2)).startswith(b"HTTP/1.1 408")
+        writer.close()
+
+    serve(test)
+
+
+def test_serves_on_unix_socket(tmp_path):
+    path = str(tmp_path / "tessellation.sock")
+
+    async def main():
+        server = TessellationServer(path=path, pop_size=10, generations=5)
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_unix_connection(path)
+            body = json.dumps({"points": SQUARE}).encode()
+            writer.write(b"POST /tessellate HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % len(body) + body)
+            response = await reader.read()
+            writer.close()
+        finally:
+            await server.close()
+        assert response.startswith(b"HTTP/1.1 200")
+        assert json.loads(response.partition(b"\r\n\r\n")[2])["complete"]
+        assert not os.path.exists(path)
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize("options", [
+    {"workers": 0},
+    {"max_queue_depth": 0},
+    {"time_budget": 0},
+    {"time_budget": 10, "max_time_budget": 5},
+    {"pop_size": 1},
+    {"generations": -1},
+    {"mutation_rate": 1.5},
+])
+def test_rejects_invalid_configuration(options):
+    with pytest.raises(ValueError):
+        TessellationServer(**options)
+
+
+def test_routes_unknown_paths_and_methods():
+    async def test(server):
+        assert (await request(server, "GET", "/nowhere"))[0] == 404
+        assert (await request(server, "GET", "/tessellate"))[0] == 405
+        assert (await request(server, "POST", "/metrics"))[0] == 405
+
+    serve(test)
+
+
+def test_metrics_shape():
+    async def test(server):
+        await request(server, "POST", "/tessellate", {"points": SQUARE})
+        status, _, metrics = await request(server, "GET", "/metrics")
+        assert status == 200
+        assert set(metrics) == {"requests", "completed", "cache_hits", "coalesced", "rejected", "timeouts", "failed",
+                                "queue_depth", "max_queue_depth", "in_flight", "busy_workers", "cache_entries",
+                                "uptime", "throughput", "latency"}
+        assert set(metrics["latency"]) == {"mean", "p50", "p95", "max"}
+        assert metrics["requests"] == metrics["completed"] == 1
+        assert metrics["latency"]["max"] > 0 and metrics["throughput"] > 0
+
+    serve(test, pop_size=10, generations=5)